@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, render_template, session, Response
+from flask import Flask, Blueprint, request, jsonify, render_template, session, Response, current_app
 from openai import OpenAI
 import os
 from dotenv import load_dotenv
@@ -6,29 +6,86 @@ import logging
 import time
 import uuid
 import json
-from database import ResearchDatabase
-
-# Load environment variables
-load_dotenv()
-
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
+from typing import Optional
+from database import ResearchDatabase, migrate_database
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Reka client
-client = OpenAI(
-    base_url="https://api.reka.ai/v1",
-    api_key=os.getenv("REKA_API_KEY")
-)
+bp = Blueprint('research', __name__)
 
-# Initialize database
-db = ResearchDatabase()
+def reset_resources(app: Flask):
+    """Drop an app's per-process resources so they are rebuilt in the current process"""
+    app.extensions['research'] = {'pid': os.getpid(), 'client': None, 'db': None}
+
+def _resources() -> dict:
+    """Return the current app's resources, created lazily in each process.
+    
+    Nothing here may be shared across a fork: the OpenAI client owns an HTTP
+    connection pool. A forked child inherits the parent's objects, so they
+    are dropped whenever the pid changes.
+    """
+    app = current_app._get_current_object()
+    resources = app.extensions.get('research')
+    if resources is None or resources['pid'] != os.getpid():
+        reset_resources(app)
+    return app.extensions['research']
+
+def get_client() -> OpenAI:
+    """Return this process's Reka client for the current app, creating it on first use"""
+    resources = _resources()
+    if resources['client'] is None:
+        resources['client'] = OpenAI(
+            base_url="https://api.reka.ai/v1",
+            api_key=current_app.config['REKA_API_KEY']
+        )
+    return resources['client']
+
+def get_db() -> ResearchDatabase:
+    """Return this process's database handle for the current app, creating it on first use"""
+    resources = _resources()
+    if resources['db'] is None:
+        # The schema is migrated once at startup, not in every worker
+        resources['db'] = ResearchDatabase(
+            current_app.config['DATABASE_PATH'],
+            partition_by=current_app.config['DB_PARTITION_BY'],
+            init_schema=False
+        )
+    return resources['db']
+
+def create_app(test_config: Optional[dict] = None) -> Flask:
+    """Create the Flask application.
+    
+    Nothing is set up at import time. HTTP clients and database handles are
+    created lazily in each process; set MIGRATE_ON_START to False when the
+    schema is migrated elsewhere (see wsgi.py).
+    """
+    # Load environment variables
+    load_dotenv()
+    
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
+    app.config['REKA_API_KEY'] = os.getenv('REKA_API_KEY')
+    app.config['DATABASE_PATH'] = os.getenv('DATABASE_PATH', 'research.db')
+    # DB_PARTITION_BY=month|day|year enables partitioned storage
+    app.config['DB_PARTITION_BY'] = os.getenv('DB_PARTITION_BY')
+    app.config['MIGRATE_ON_START'] = True
+    if test_config:
+        app.config.update(test_config)
+    
+    if app.config['MIGRATE_ON_START']:
+        migrate_database(app.config['DATABASE_PATH'], app.config['DB_PARTITION_BY'])
+    
+    app.register_blueprint(bp)
+    return app
 
 def handle_streaming_response(messages, session_id, user_message, start_time):
     """Handle streaming response from Reka Research API"""
+    # Resolve per-process resources while the app context is still active
+    client = get_client()
+    db = get_db()
+    
     def generate():
         try:
             response_content = ""
@@ -97,11 +154,11 @@ def handle_streaming_response(messages, session_id, user_message, start_time):
         }
     )
 
-@app.route('/')
+@bp.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/api/chat', methods=['POST'])
+@bp.route('/api/chat', methods=['POST'])
 def chat():
     try:
         data = request.get_json(silent=True)
@@ -117,7 +174,7 @@ def chat():
         session_id = data.get('session_id')
         if not session_id:
             session_id = str(uuid.uuid4())
-            db.create_session(session_id)
+            get_db().create_session(session_id)
         
         # Get conversation history if provided
         messages = data.get('messages', [])
@@ -141,7 +198,7 @@ def chat():
         
         # Make API call to Reka Research (non-streaming)
         try:
-            completion = client.chat.completions.create(
+            completion = get_client().chat.completions.create(
                 model="reka-flash-research",
                 messages=messages,
                 stream=False
@@ -166,7 +223,7 @@ def chat():
         
         # Save research to database
         tokens_used = completion.usage.total_tokens if hasattr(completion, 'usage') and completion.usage else 0
-        db.save_research(
+        get_db().save_research(
             session_id=session_id,
             query=user_message,
             response=response_content,
@@ -190,14 +247,14 @@ def chat():
             'success': False
         }), 500
 
-@app.route('/api/health', methods=['GET'])
+@bp.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy', 'service': 'Reka Research Web App'})
 
-@app.route('/api/models', methods=['GET'])
+@bp.route('/api/models', methods=['GET'])
 def get_models():
     try:
-        models = client.models.list()
+        models = get_client().models.list()
         return jsonify({
             'models': [model.id for model in models.data],
             'success': True
@@ -210,10 +267,10 @@ def get_models():
             'success': False
         }), 500
 
-@app.route('/api/history', methods=['GET'])
+@bp.route('/api/history', methods=['GET'])
 def get_research_history():
     try:
-        sessions = db.get_all_sessions()
+        sessions = get_db().get_all_sessions()
         return jsonify({
             'sessions': sessions,
             'success': True
@@ -226,10 +283,10 @@ def get_research_history():
             'success': False
         }), 500
 
-@app.route('/api/history/<session_id>', methods=['GET'])
+@bp.route('/api/history/<session_id>', methods=['GET'])
 def get_session_history(session_id):
     try:
-        history = db.get_session_history(session_id)
+        history = get_db().get_session_history(session_id)
         return jsonify({
             'session_id': session_id,
             'history': history,
@@ -243,16 +300,26 @@ def get_session_history(session_id):
             'success': False
         }), 500
 
-@app.route('/api/search', methods=['GET'])
+@bp.route('/api/search', methods=['GET'])
 def search_research():
     try:
         search_term = request.args.get('q', '')
+        domain = request.args.get('domain', '')
         limit = int(request.args.get('limit', 50))
         
+        if domain:
+            # Answered from the citation index instead of scanning responses
+            results = get_db().search_by_domain(domain, limit)
+            return jsonify({
+                'domain': domain,
+                'results': results,
+                'success': True
+            })
+        
         if not search_term:
-            return jsonify({'error': 'Search term is required'}), 400
+            return jsonify({'error': 'Search term or domain is required'}), 400
         
-        results = db.search_queries(search_term, limit)
+        results = get_db().search_queries(search_term, limit)
         return jsonify({
             'search_term': search_term,
             'results': results,
@@ -266,10 +333,30 @@ def search_research():
             'success': False
         }), 500
 
-@app.route('/api/stats', methods=['GET'])
+@bp.route('/api/sources', methods=['GET'])
+def get_sources():
+    try:
+        domain = request.args.get('domain') or None
+        session_id = request.args.get('session_id') or None
+        limit = int(request.args.get('limit', 50))
+        
+        sources = get_db().get_sources(domain=domain, session_id=session_id, limit=limit)
+        return jsonify({
+            'sources': sources,
+            'success': True
+        })
+    except Exception as e:
+        logger.error(f"Error fetching sources: {str(e)}")
+        return jsonify({
+            'error': 'Failed to fetch sources',
+            'details': str(e),
+            'success': False
+        }), 500
+
+@bp.route('/api/stats', methods=['GET'])
 def get_database_stats():
     try:
-        stats = db.get_database_stats()
+        stats = get_db().get_database_stats()
         return jsonify({
             'stats': stats,
             'success': True
@@ -282,7 +369,7 @@ def get_database_stats():
             'success': False
         }), 500
 
-@app.route('/api/reset', methods=['POST'])
+@bp.route('/api/reset', methods=['POST'])
 def reset_database():
     try:
         # Get confirmation from request
@@ -294,20 +381,19 @@ def reset_database():
             }), 400
         
         # Reset database by reinitializing
-        global db
-        import os
-        db_path = "research.db"
+        db = get_db()
+        db_path = db.db_path
         
         # Close existing connection if any
         db.close()
         
-        # Remove existing database file
+        # Remove existing database file (and any partition files)
         if os.path.exists(db_path):
-            os.remove(db_path)
+            db.remove_database_files()
             logger.info("Database file removed")
         
         # Reinitialize database
-        db = ResearchDatabase(db_path)
+        _resources()['db'] = ResearchDatabase(db_path, partition_by=db.partition_by)
         logger.info("Database reset successfully")
         
         return jsonify({
@@ -323,7 +409,7 @@ def reset_database():
             'success': False
         }), 500
 
-@app.route('/api/clear', methods=['POST'])
+@bp.route('/api/clear', methods=['POST'])
 def clear_database():
     try:
         # Get confirmation from request
@@ -335,7 +421,7 @@ def clear_database():
             }), 400
         
         # Clear all data from database
-        if db.clear_all_data():
+        if get_db().clear_all_data():
             logger.info("Database cleared successfully")
             return jsonify({
                 'message': 'Database cleared successfully',
@@ -355,8 +441,19 @@ def clear_database():
             'success': False
         }), 500
 
+def __getattr__(name):
+    # Keeps the original "gunicorn app:app" command working: the app is built
+    # on first access instead of at import time
+    if name == 'app':
+        app = create_app()
+        globals()['app'] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == '__main__':
-    if not os.getenv('REKA_API_KEY'):
+    app = create_app()
+    
+    if not app.config['REKA_API_KEY']:
         logger.warning("REKA_API_KEY not found in environment variables")
         print("Please set your REKA_API_KEY in the .env file")
     
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Citation index backfill for Reka Research Web App
+Run this script once to index the sources cited by research saved before the
+source index existed. New research is indexed automatically when it is saved.
+"""
+
+import argparse
+import os
+import sys
+import time
+from database import ResearchDatabase
+
+def main():
+    parser = argparse.ArgumentParser(description="Index citations of existing research responses")
+    parser.add_argument("--db", default=os.getenv("DATABASE_PATH", "research.db"), help="Database file")
+    parser.add_argument("--partition-by", default=os.getenv("DB_PARTITION_BY"),
+                        choices=["year", "month", "day"], help="Partitioned storage layout")
+    parser.add_argument("--batch-size", type=int, default=500, help="Queries indexed per commit")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"[ERROR] Database '{args.db}' not found")
+        return False
+
+    print("Backfilling citation index...")
+
+    db = ResearchDatabase(args.db, partition_by=args.partition_by)
+    start = time.perf_counter()
+    processed = db.backfill_sources(batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    sources = db.get_sources(limit=5)
+    print(f"[OK] Indexed {processed} queries in {elapsed:.2f}s")
+    if sources:
+        print("\nMost cited sources:")
+        for source in sources:
+            print(f"   - {source['url']} ({source['citation_count']} citations)")
+
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Storage benchmark for Reka Research Web App
+Compares write throughput and query latency of the single-file database
+against partitioned storage at large row counts
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from database import ResearchDatabase
+
+WORDS = ["paris", "climate", "python", "market", "history", "energy",
+         "travel", "health", "space", "economy", "ocean", "music"]
+
+def random_text(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+def time_call(func, repeat):
+    """Return the median latency of func() in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def run_benchmark(workdir, partition_by, rows, sessions, months, repeat):
+    db = ResearchDatabase(os.path.join(workdir, "research.db"), partition_by=partition_by)
+    rng = random.Random(42)
+    start_date = datetime.utcnow() - timedelta(days=30 * months)
+    step = timedelta(days=30 * months) / rows
+
+    # Write phase: rows are spread evenly over the requested number of months
+    start = time.perf_counter()
+    for i in range(rows):
+        db.save_research(
+            session_id=f"session_{rng.randrange(sessions)}",
+            query=random_text(rng, 8),
+            response=random_text(rng, 120),
+            tokens_used=rng.randrange(100, 2000),
+            response_time=rng.uniform(1.0, 30.0),
+            created_at=start_date + step * i
+        )
+    write_seconds = time.perf_counter() - start
+
+    # Read phase
+    sample_session = f"session_{rng.randrange(sessions)}"
+    return {
+        'writes_per_sec': rows / write_seconds,
+        'session_history_ms': time_call(lambda: db.get_session_history(sample_session), repeat),
+        'search_ms': time_call(lambda: db.search_queries("paris", 20), repeat),
+        'stats_ms': time_call(db.get_database_stats, repeat),
+        'all_sessions_ms': time_call(db.get_all_sessions, repeat),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-file vs partitioned storage")
+    parser.add_argument("--rows", type=int, default=20000, help="Research queries to write")
+    parser.add_argument("--sessions", type=int, default=500, help="Distinct sessions")
+    parser.add_argument("--months", type=int, default=12, help="Months the rows are spread over")
+    parser.add_argument("--partition-by", default="month", choices=["year", "month", "day"])
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per read query")
+    args = parser.parse_args()
+
+    print(f"Benchmarking {args.rows} rows over {args.months} months, {args.sessions} sessions...")
+
+    results = {}
+    for label, partition_by in (("single-file", None), (f"partitioned ({args.partition_by})", args.partition_by)):
+        workdir = tempfile.mkdtemp(prefix="reka_bench_")
+        try:
+            results[label] = run_benchmark(workdir, partition_by, args.rows,
+                                           args.sessions, args.months, args.repeat)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    labels = list(results)
+    print(f"\n{'metric':<22}" + "".join(f"{label:>24}" for label in labels))
+    for metric in results[labels[0]]:
+        print(f"{metric:<22}" + "".join(f"{results[label][metric]:>24.2f}" for label in labels))
+
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for Reka Research Web App
+Starts gunicorn with and without --preload and measures the time to the first
+served request and the memory used by each worker (Linux only)
+"""
+
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+def wait_for_request(url, timeout):
+    """Poll url until it answers, returning the elapsed seconds"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.01)
+    raise TimeoutError(f"No response from {url} within {timeout}s")
+
+def child_pids(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+def memory_kb(pid):
+    """Return (rss, pss) in kB; PSS splits pages shared with the master and other workers"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0]] = int(parts[1])
+    return values.get("Rss:", 0), values.get("Pss:", 0)
+
+def run_benchmark(preload, workers, port, requests_per_worker, timeout):
+    workdir = tempfile.mkdtemp(prefix="reka_startup_")
+    env = dict(os.environ,
+               GUNICORN_PRELOAD="true" if preload else "false",
+               DATABASE_PATH=os.path.join(workdir, "research.db"),
+               REKA_API_KEY=os.getenv("REKA_API_KEY", "benchmark"))
+    command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+               "-w", str(workers), "-b", f"127.0.0.1:{port}", "wsgi:app"]
+
+    start = time.perf_counter()
+    master = subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_request(f"http://127.0.0.1:{port}/api/health", timeout)
+        first_request = time.perf_counter() - start
+
+        # Wait for every worker to boot, then warm them up so the lazy
+        # client and database handles exist before memory is sampled
+        while len(child_pids(master.pid)) < workers:
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError("Workers did not start in time")
+            time.sleep(0.05)
+        all_workers = time.perf_counter() - start
+        for _ in range(workers * requests_per_worker):
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/stats", timeout=5).read()
+
+        samples = [memory_kb(pid) for pid in child_pids(master.pid)]
+        return {
+            'first_request_s': first_request,
+            'all_workers_s': all_workers,
+            'rss_per_worker_mb': sum(rss for rss, _ in samples) / len(samples) / 1024,
+            'pss_per_worker_mb': sum(pss for _, pss in samples) / len(samples) / 1024,
+        }
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gunicorn startup with and without --preload")
+    parser.add_argument("--workers", type=int, default=4, help="Gunicorn workers")
+    parser.add_argument("--port", type=int, default=5055, help="Port to bind during the benchmark")
+    parser.add_argument("--requests", type=int, default=5, help="Warm-up requests per worker")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Startup timeout in seconds")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("[ERROR] This benchmark needs Linux /proc to measure worker memory")
+        return False
+
+    print(f"Benchmarking gunicorn startup with {args.workers} workers...")
+
+    results = {}
+    for label, preload in (("no preload", False), ("preload", True)):
+        results[label] = run_benchmark(preload, args.workers, args.port,
+                                       args.requests, args.timeout)
+
+    labels = list(results)
+    print(f"\n{'metric':<22}" + "".join(f"{label:>16}" for label in labels))
+    for metric in results[labels[0]]:
+        print(f"{metric:<22}" + "".join(f"{results[label][metric]:>16.2f}" for label in labels))
+
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
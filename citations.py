@@ -0,0 +1,80 @@
+import re
+from typing import List, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Markdown links, the form Reka uses for inline citations: [title](url).
+# URLs may contain one level of balanced parentheses, as Wikipedia's often do.
+MARKDOWN_LINK = re.compile(r'\[([^\]]*)\]\((https?://(?:[^\s()]|\([^\s()]*\))+)\)')
+
+# Bare URLs anywhere else in the text, with the same parentheses rule
+BARE_URL = re.compile(r'https?://(?:[^\s<>()\[\]"\']|\([^\s<>()\[\]"\']*\))+')
+
+# Query parameters that only track the click, not the page
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+def normalize_domain(value: str) -> str:
+    """Normalize a host name or URL to the domain stored in the source index"""
+    value = value.strip().lower()
+    if '://' in value:
+        value = urlsplit(value).hostname or ''
+    else:
+        value = value.split('/')[0].split(':')[0]
+    if value.startswith('www.'):
+        value = value[4:]
+    return value.rstrip('.')
+
+def domain_key(domain: str) -> str:
+    """Reverse a domain's labels so it and its subdomains share a prefix: en.wikipedia.org -> org.wikipedia.en."""
+    return '.'.join(reversed(domain.split('.'))) + '.'
+
+def normalize_url(url: str) -> Optional[str]:
+    """Normalize a cited URL so the same page is indexed once, or None if it is not a web URL"""
+    try:
+        parts = urlsplit(url.strip())
+        host = parts.hostname
+        port = parts.port
+    except ValueError:
+        return None
+
+    if parts.scheme.lower() not in ('http', 'https') or not host:
+        return None
+
+    scheme = parts.scheme.lower()
+    netloc = normalize_domain(host)
+    if port and not (scheme == 'http' and port == 80) and not (scheme == 'https' and port == 443):
+        netloc = f"{netloc}:{port}"
+
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    ])
+    path = parts.path or '/'
+
+    # Fragments point inside the same page, so they are dropped
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+def extract_sources(text: str) -> List[Dict]:
+    """Extract the cited sources from a research response, in order of first citation"""
+    if not text:
+        return []
+
+    candidates = [(match.group(2), match.group(1).strip()) for match in MARKDOWN_LINK.finditer(text)]
+    remainder = MARKDOWN_LINK.sub(' ', text)
+    candidates.extend((match.group(0).rstrip('.,;:!?*_'), '') for match in BARE_URL.finditer(remainder))
+
+    sources = {}
+    for raw_url, title in candidates:
+        url = normalize_url(raw_url)
+        if not url:
+            continue
+
+        source = sources.setdefault(url, {
+            'url': url,
+            'domain': normalize_domain(url),
+            'title': None
+        })
+        # Prefer a descriptive title over bare citation markers like "1"
+        if title and not title.isdigit() and not source['title']:
+            source['title'] = title
+
+    return list(sources.values())
@@ -1,13 +1,54 @@
 import sqlite3
 import json
+import heapq
 from datetime import datetime
 from typing import List, Dict, Optional
 import os
+import shutil
+from pathlib import Path
+from citations import extract_sources, normalize_domain, domain_key
+
+# strftime formats used to name partition files for each supported granularity
+PARTITION_FORMATS = {
+    'year': '%Y',
+    'month': '%Y-%m',
+    'day': '%Y-%m-%d',
+}
+
+# Partition N hands out research_queries ids starting at N * PARTITION_ID_SPAN,
+# so ids stay unique across partition files
+PARTITION_ID_SPAN = 10 ** 10
+
+def migrate_database(db_path: Optional[str] = None, partition_by: Optional[str] = None):
+    """Create or migrate the database schema.
+    
+    Without arguments the settings come from DATABASE_PATH and DB_PARTITION_BY
+    (including .env). Under gunicorn this runs once in the master from the
+    on_starting hook in gunicorn.conf.py, which must not import Flask or OpenAI.
+    """
+    if db_path is None:
+        from dotenv import load_dotenv
+        load_dotenv()
+        db_path = os.getenv('DATABASE_PATH', 'research.db')
+        partition_by = os.getenv('DB_PARTITION_BY')
+    
+    ResearchDatabase(db_path, partition_by=partition_by)
 
 class ResearchDatabase:
-    def __init__(self, db_path: str = "research.db"):
+    def __init__(self, db_path: str = "research.db", partition_by: Optional[str] = None,
+                 max_attached: int = 8, init_schema: bool = True):
+        if partition_by and partition_by not in PARTITION_FORMATS:
+            raise ValueError(f"Unsupported partition_by value: {partition_by}")
+        
         self.db_path = db_path
-        self.init_database()
+        self.partition_by = partition_by or None
+        # SQLite allows at most 10 attached databases per connection by default
+        self.max_attached = max(1, min(max_attached, 10))
+        self.partition_dir = os.path.splitext(db_path)[0] + "_partitions"
+        # partition_key -> file path, so writes skip the registry lookup
+        self._partition_paths = {}
+        if init_schema:
+            self.init_database()
     
     def init_database(self):
         """Initialize the database with required tables"""
@@ -24,9 +65,148 @@ class ResearchDatabase:
             )
         ''')
         
-        # Create research_queries table
+        if self.partition_by:
+            # Research queries live in per-period partition files; the main
+            # database only keeps sessions and the routing tables
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS partitions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    partition_key TEXT UNIQUE NOT NULL,
+                    path TEXT NOT NULL,
+                    read_only INTEGER DEFAULT 0,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS session_partitions (
+                    session_id TEXT NOT NULL,
+                    partition_key TEXT NOT NULL,
+                    PRIMARY KEY (session_id, partition_key)
+                )
+            ''')
+            
+            os.makedirs(self.partition_dir, exist_ok=True)
+        else:
+            self._create_queries_table(cursor)
+        
+        # Create the citation index; it always lives in the main database so
+        # source lookups never touch research_queries
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT UNIQUE NOT NULL,
+                domain TEXT NOT NULL,
+                domain_key TEXT NOT NULL,
+                title TEXT,
+                citation_count INTEGER DEFAULT 0,
+                first_cited_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_cited_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS research_queries (
+            CREATE TABLE IF NOT EXISTS query_sources (
+                query_id INTEGER NOT NULL,
+                source_id INTEGER NOT NULL,
+                session_id TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                domain_key TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (query_id, source_id),
+                FOREIGN KEY (source_id) REFERENCES sources (id)
+            )
+        ''')
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sources_domain ON sources(domain_key)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sources_citations ON sources(citation_count)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_query_sources_domain ON query_sources(domain_key, created_at, query_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_query_sources_session ON query_sources(session_id)')
+        
+        conn.commit()
+        conn.close()
+        
+        if self.partition_by:
+            self._migrate_to_partitions()
+    
+    @staticmethod
+    def _domain_range(domain: str) -> tuple:
+        """Return the domain_key bounds matching a domain and all of its subdomains"""
+        key = domain_key(normalize_domain(domain))
+        # '/' sorts right after '.', so [key, upper) is exactly the keys with this prefix
+        return key, key[:-1] + '/'
+    
+    def _migrate_to_partitions(self) -> int:
+        """Move rows left in a single-file research_queries table into partitions.
+        
+        Each period is moved in one transaction, so an interrupted migration
+        resumes on the next start. Returns the number of queries moved.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'research_queries'")
+        if not cursor.fetchone():
+            conn.close()
+            return 0
+        
+        key_sql = "strftime(?, COALESCE(created_at, CURRENT_TIMESTAMP))"
+        fmt = PARTITION_FORMATS[self.partition_by]
+        cursor.execute(f'SELECT {key_sql}, COUNT(*) FROM research_queries GROUP BY 1', (fmt,))
+        periods = cursor.fetchall()
+        
+        moved = 0
+        for partition_key, count in periods:
+            path = self._get_partition(partition_key)
+            
+            cursor.execute('ATTACH DATABASE ? AS part', (path,))
+            cursor.execute('CREATE TEMP TABLE IF NOT EXISTS id_map (old_id INTEGER PRIMARY KEY, new_id INTEGER)')
+            cursor.execute('DELETE FROM id_map')
+            
+            # Let the partition's sequence assign ids so they cannot collide
+            # with rows already written to it, and remember the mapping
+            rows = conn.execute(f'''
+                SELECT id, session_id, query, response, model, tokens_used, response_time, created_at
+                FROM research_queries
+                WHERE {key_sql} = ?
+                ORDER BY id
+            ''', (fmt, partition_key))
+            for row in rows:
+                cursor.execute('''
+                    INSERT INTO part.research_queries
+                    (session_id, query, response, model, tokens_used, response_time, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', row[1:])
+                cursor.execute('INSERT INTO id_map (old_id, new_id) VALUES (?, ?)', (row[0], cursor.lastrowid))
+            
+            cursor.execute('''
+                UPDATE query_sources
+                SET query_id = (SELECT new_id FROM id_map WHERE old_id = query_sources.query_id)
+                WHERE query_id IN (SELECT old_id FROM id_map)
+            ''')
+            
+            cursor.execute(f'''
+                INSERT OR IGNORE INTO session_partitions (session_id, partition_key)
+                SELECT DISTINCT session_id, ? FROM research_queries WHERE {key_sql} = ?
+            ''', (partition_key, fmt, partition_key))
+            
+            cursor.execute(f'DELETE FROM research_queries WHERE {key_sql} = ?', (fmt, partition_key))
+            conn.commit()
+            cursor.execute('DETACH DATABASE part')
+            moved += count
+        
+        cursor.execute('DROP TABLE research_queries')
+        conn.commit()
+        conn.close()
+        
+        if moved:
+            print(f"Migrated {moved} research queries into {len(periods)} partitions")
+        return moved
+    
+    def _create_queries_table(self, cursor, schema: str = "main"):
+        """Create the research_queries table and its indexes in the given schema"""
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {schema}.research_queries (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 session_id TEXT NOT NULL,
                 query TEXT NOT NULL,
@@ -40,12 +220,158 @@ class ResearchDatabase:
         ''')
         
         # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_id ON research_queries(session_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON research_queries(created_at)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_query_text ON research_queries(query)')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_session_id ON research_queries(session_id)')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_created_at ON research_queries(created_at)')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_query_text ON research_queries(query)')
+    
+    def _partition_key(self, timestamp: datetime) -> str:
+        """Return the partition key a row created at the given UTC time belongs to"""
+        return timestamp.strftime(PARTITION_FORMATS[self.partition_by])
+    
+    def _get_partition(self, partition_key: str) -> str:
+        """Return the file path of a partition, creating and registering it if needed"""
+        if partition_key in self._partition_paths:
+            return self._partition_paths[partition_key]
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT path FROM partitions WHERE partition_key = ?', (partition_key,))
+        row = cursor.fetchone()
+        if row:
+            conn.close()
+            self._partition_paths[partition_key] = row[0]
+            return row[0]
         
+        base_name = os.path.splitext(os.path.basename(self.db_path))[0]
+        path = os.path.join(self.partition_dir, f"{base_name}_{partition_key}.db")
+        cursor.execute('''
+            INSERT OR IGNORE INTO partitions (partition_key, path)
+            VALUES (?, ?)
+        ''', (partition_key, path))
         conn.commit()
+        
+        cursor.execute('SELECT id, path FROM partitions WHERE partition_key = ?', (partition_key,))
+        ordinal, path = cursor.fetchone()
+        conn.close()
+        
+        # The partition directory is gone if another process reset the database
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part_conn = sqlite3.connect(path)
+        part_cursor = part_conn.cursor()
+        self._create_queries_table(part_cursor)
+        # Start this partition's ids in its own range so they never collide
+        part_cursor.execute('''
+            INSERT INTO sqlite_sequence (name, seq)
+            SELECT 'research_queries', ?
+            WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'research_queries')
+        ''', (ordinal * PARTITION_ID_SPAN,))
+        part_conn.commit()
+        part_conn.close()
+        
+        self._partition_paths[partition_key] = path
+        return path
+    
+    def _list_partitions(self, session_id: Optional[str] = None) -> List[tuple]:
+        """List (path, read_only) for partitions, newest first, optionally for one session"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        if session_id is None:
+            cursor.execute('''
+                SELECT path, read_only FROM partitions
+                ORDER BY partition_key DESC
+            ''')
+        else:
+            cursor.execute('''
+                SELECT p.path, p.read_only
+                FROM session_partitions sp
+                JOIN partitions p ON p.partition_key = sp.partition_key
+                WHERE sp.session_id = ?
+                ORDER BY p.partition_key DESC
+            ''', (session_id,))
+        
+        rows = cursor.fetchall()
         conn.close()
+        return rows
+    
+    def _partition_batches(self, session_id: Optional[str] = None):
+        """Yield read connections exposing a research_queries view over a batch of partitions.
+        
+        Partitions are visited newest first, at most max_attached at a time, so
+        only a bounded number of partition files is open at once.
+        """
+        partitions = self._list_partitions(session_id)
+        
+        for start in range(0, len(partitions), self.max_attached):
+            batch = partitions[start:start + self.max_attached]
+            conn = sqlite3.connect(self.db_path, uri=True)
+            try:
+                cursor = conn.cursor()
+                selects = []
+                for index, (path, read_only) in enumerate(batch):
+                    uri = Path(path).absolute().as_uri()
+                    if read_only:
+                        uri += "?mode=ro"
+                    cursor.execute('ATTACH DATABASE ? AS ?', (uri, f"p{index}"))
+                    selects.append(f"SELECT * FROM p{index}.research_queries")
+                
+                cursor.execute(
+                    'CREATE TEMP VIEW research_queries AS ' + ' UNION ALL '.join(selects)
+                )
+                yield conn
+            finally:
+                conn.close()
+    
+    def archive_partitions(self, keep_recent: int = 3, archive_dir: Optional[str] = None) -> int:
+        """Make all but the most recent partitions read-only, optionally moving them to archive_dir"""
+        if not self.partition_by:
+            return 0
+        
+        try:
+            keep_recent = max(1, keep_recent)
+            current_key = self._partition_key(datetime.utcnow())
+            
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT partition_key, path, read_only FROM partitions
+                ORDER BY partition_key DESC
+            ''')
+            # Count recent partitions from the ones that exist; the current
+            # period's partition always stays writable, even if it is not recent
+            stale = [
+                (partition_key, path)
+                for partition_key, path, read_only in cursor.fetchall()[keep_recent:]
+                if not read_only and partition_key < current_key
+            ]
+            
+            for partition_key, path in stale:
+                # Compact the partition once, since it will not change again
+                part_conn = sqlite3.connect(path)
+                part_conn.execute('VACUUM')
+                part_conn.close()
+                
+                if archive_dir:
+                    os.makedirs(archive_dir, exist_ok=True)
+                    new_path = os.path.join(archive_dir, os.path.basename(path))
+                    shutil.move(path, new_path)
+                    path = new_path
+                
+                os.chmod(path, 0o444)
+                self._partition_paths.pop(partition_key, None)
+                cursor.execute('''
+                    UPDATE partitions SET read_only = 1, path = ?
+                    WHERE partition_key = ?
+                ''', (path, partition_key))
+            
+            conn.commit()
+            conn.close()
+            return len(stale)
+        except Exception as e:
+            print(f"Error archiving partitions: {e}")
+            return 0
     
     def create_session(self, session_id: str) -> bool:
         """Create a new research session"""
@@ -67,8 +393,12 @@ class ResearchDatabase:
     
     def save_research(self, session_id: str, query: str, response: str, 
                      model: str = 'reka-flash-research', tokens_used: int = 0, 
-                     response_time: float = 0.0) -> bool:
+                     response_time: float = 0.0, created_at: Optional[datetime] = None) -> bool:
         """Save a research query and response to the database"""
+        if self.partition_by:
+            return self._save_partitioned_research(session_id, query, response, model,
+                                                   tokens_used, response_time, created_at)
+        
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -79,9 +409,11 @@ class ResearchDatabase:
             # Insert research query
             cursor.execute('''
                 INSERT INTO research_queries 
-                (session_id, query, response, model, tokens_used, response_time)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (session_id, query, response, model, tokens_used, response_time))
+                (session_id, query, response, model, tokens_used, response_time, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ''', (session_id, query, response, model, tokens_used, response_time,
+                  self._format_timestamp(created_at)))
+            query_id = cursor.lastrowid
             
             # Update session timestamp
             cursor.execute('''
@@ -90,6 +422,9 @@ class ResearchDatabase:
                 WHERE session_id = ?
             ''', (session_id,))
             
+            self._index_sources(cursor, query_id, session_id, response,
+                                self._format_timestamp(created_at))
+            
             conn.commit()
             conn.close()
             return True
@@ -97,21 +432,136 @@ class ResearchDatabase:
             print(f"Error saving research: {e}")
             return False
     
-    def get_session_history(self, session_id: str) -> List[Dict]:
-        """Get all research queries for a specific session"""
+    def _save_partitioned_research(self, session_id: str, query: str, response: str,
+                                   model: str, tokens_used: int, response_time: float,
+                                   created_at: Optional[datetime]) -> bool:
+        """Save a research query to the partition file for its creation time"""
         try:
+            created_at = created_at or datetime.utcnow()
+            partition_key = self._partition_key(created_at)
+            row = (session_id, query, response, model, tokens_used, response_time,
+                   self._format_timestamp(created_at))
+            
+            try:
+                query_id = self._insert_partition_query(self._get_partition(partition_key), row)
+            except sqlite3.OperationalError:
+                # The cached partition may have been cleared, reset or moved by
+                # another process; resolve it from the registry again and retry
+                self._partition_paths.pop(partition_key, None)
+                query_id = self._insert_partition_query(self._get_partition(partition_key), row)
+            
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
+                INSERT OR IGNORE INTO research_sessions (session_id)
+                VALUES (?)
+            ''', (session_id,))
+            
+            cursor.execute('''
+                UPDATE research_sessions 
+                SET updated_at = CURRENT_TIMESTAMP 
+                WHERE session_id = ?
+            ''', (session_id,))
+            
+            # Record which partitions hold this session's queries
+            cursor.execute('''
+                INSERT OR IGNORE INTO session_partitions (session_id, partition_key)
+                VALUES (?, ?)
+            ''', (session_id, partition_key))
+            
+            self._index_sources(cursor, query_id, session_id, response,
+                                self._format_timestamp(created_at))
+            
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            print(f"Error saving research: {e}")
+            return False
+    
+    @staticmethod
+    def _insert_partition_query(path: str, row: tuple) -> int:
+        """Insert a research query into a partition file and return its id"""
+        # mode=rw never creates a stray empty file for a partition that is gone
+        part_conn = sqlite3.connect(Path(path).absolute().as_uri() + '?mode=rw', uri=True)
+        try:
+            # The bulky insert only locks the partition file
+            part_cursor = part_conn.execute('''
+                INSERT INTO research_queries 
+                (session_id, query, response, model, tokens_used, response_time, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', row)
+            part_conn.commit()
+            return part_cursor.lastrowid
+        finally:
+            part_conn.close()
+    
+    def _index_sources(self, cursor, query_id: int, session_id: str, response: str,
+                       created_at: Optional[str]) -> int:
+        """Parse the citations out of a response and add them to the source index"""
+        sources = extract_sources(response)
+        
+        for source in sources:
+            cursor.execute('''
+                INSERT OR IGNORE INTO sources (url, domain, domain_key, title, citation_count,
+                                               first_cited_at, last_cited_at)
+                VALUES (?, ?, ?, ?, 0, COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))
+            ''', (source['url'], source['domain'], domain_key(source['domain']), source['title'],
+                  created_at, created_at))
+            
+            cursor.execute('SELECT id FROM sources WHERE url = ?', (source['url'],))
+            source_id = cursor.fetchone()[0]
+            
+            cursor.execute('''
+                INSERT OR IGNORE INTO query_sources (query_id, source_id, session_id, domain,
+                                                     domain_key, created_at)
+                VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ''', (query_id, source_id, session_id, source['domain'],
+                  domain_key(source['domain']), created_at))
+            
+            # Keep the per-source counters in step, so re-indexing is harmless
+            if cursor.rowcount:
+                cursor.execute('''
+                    UPDATE sources
+                    SET citation_count = citation_count + 1,
+                        title = COALESCE(title, ?),
+                        first_cited_at = MIN(first_cited_at, COALESCE(?, CURRENT_TIMESTAMP)),
+                        last_cited_at = MAX(last_cited_at, COALESCE(?, CURRENT_TIMESTAMP))
+                    WHERE id = ?
+                ''', (source['title'], created_at, created_at, source_id))
+        
+        return len(sources)
+    
+    @staticmethod
+    def _format_timestamp(timestamp: Optional[datetime]) -> Optional[str]:
+        """Format a datetime the way SQLite's CURRENT_TIMESTAMP does"""
+        return timestamp.strftime('%Y-%m-%d %H:%M:%S') if timestamp else None
+    
+    def get_session_history(self, session_id: str) -> List[Dict]:
+        """Get all research queries for a specific session"""
+        try:
+            sql = '''
                 SELECT id, query, response, model, tokens_used, response_time, created_at
                 FROM research_queries
                 WHERE session_id = ?
                 ORDER BY created_at ASC
-            ''', (session_id,))
+            '''
             
-            rows = cursor.fetchall()
-            conn.close()
+            if self.partition_by:
+                # Only the partitions this session wrote to are attached
+                rows = []
+                for conn in self._partition_batches(session_id):
+                    rows.extend(conn.execute(sql, (session_id,)).fetchall())
+                rows.sort(key=lambda row: (row[6], row[0]))
+            else:
+                conn = sqlite3.connect(self.db_path)
+                cursor = conn.cursor()
+                
+                cursor.execute(sql, (session_id,))
+                
+                rows = cursor.fetchall()
+                conn.close()
             
             return [
                 {
@@ -131,6 +581,9 @@ class ResearchDatabase:
     
     def get_all_sessions(self) -> List[Dict]:
         """Get all research sessions with summary info"""
+        if self.partition_by:
+            return self._get_all_partitioned_sessions()
+        
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -170,22 +623,81 @@ class ResearchDatabase:
             print(f"Error getting all sessions: {e}")
             return []
     
-    def search_queries(self, search_term: str, limit: int = 50) -> List[Dict]:
-        """Search for queries containing specific terms"""
+    def _get_all_partitioned_sessions(self) -> List[Dict]:
+        """Get all research sessions, merging per-session summaries from every partition"""
         try:
+            # session_id -> [query_count, last_created_at, last_query]
+            summaries = {}
+            for conn in self._partition_batches():
+                # The bare query column comes from the row holding MAX(created_at)
+                rows = conn.execute('''
+                    SELECT session_id, COUNT(id), MAX(created_at), query
+                    FROM research_queries
+                    GROUP BY session_id
+                ''').fetchall()
+                
+                for session_id, count, last_created, last_query in rows:
+                    summary = summaries.setdefault(session_id, [0, '', None])
+                    summary[0] += count
+                    if last_created > summary[1]:
+                        summary[1] = last_created
+                        summary[2] = last_query
+            
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
+                SELECT session_id, created_at, updated_at
+                FROM research_sessions
+                ORDER BY updated_at DESC
+            ''')
+            
+            rows = cursor.fetchall()
+            conn.close()
+            
+            return [
+                {
+                    'session_id': row[0],
+                    'created_at': row[1],
+                    'updated_at': row[2],
+                    'query_count': summaries.get(row[0], [0])[0],
+                    'last_query': summaries.get(row[0], [0, '', None])[2]
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            print(f"Error getting all sessions: {e}")
+            return []
+    
+    def search_queries(self, search_term: str, limit: int = 50) -> List[Dict]:
+        """Search for queries containing specific terms"""
+        try:
+            sql = '''
                 SELECT id, session_id, query, response, created_at
                 FROM research_queries
                 WHERE query LIKE ? OR response LIKE ?
                 ORDER BY created_at DESC
                 LIMIT ?
-            ''', (f'%{search_term}%', f'%{search_term}%', limit))
+            '''
+            params = (f'%{search_term}%', f'%{search_term}%', limit)
             
-            rows = cursor.fetchall()
-            conn.close()
+            if self.partition_by:
+                # Batches go newest to oldest and partitions never overlap in
+                # time, so older partitions are skipped once the limit is met
+                rows = []
+                for conn in self._partition_batches():
+                    rows.extend(conn.execute(sql, params).fetchall())
+                    if len(rows) >= limit:
+                        break
+                rows = rows[:limit]
+            else:
+                conn = sqlite3.connect(self.db_path)
+                cursor = conn.cursor()
+                
+                cursor.execute(sql, params)
+                
+                rows = cursor.fetchall()
+                conn.close()
             
             return [
                 {
@@ -201,8 +713,202 @@ class ResearchDatabase:
             print(f"Error searching queries: {e}")
             return []
     
+    def search_by_domain(self, domain: str, limit: int = 50) -> List[Dict]:
+        """Find research whose response cites the given domain or a subdomain of it, newest first"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            # The domain and each of its subdomains are few; find them first
+            cursor.execute('''
+                SELECT DISTINCT domain_key FROM sources
+                WHERE domain_key >= ? AND domain_key < ?
+            ''', self._domain_range(domain))
+            keys = [row[0] for row in cursor.fetchall()]
+            
+            # One equality lookup per domain_key walks the index already in
+            # date order; merging the cursors lazily stops after `limit` queries
+            per_key = [
+                conn.execute('''
+                    SELECT created_at, query_id
+                    FROM query_sources
+                    WHERE domain_key = ?
+                    ORDER BY created_at DESC, query_id DESC
+                ''', (key,))
+                for key in keys
+            ]
+            
+            query_ids = []
+            for _, query_id in heapq.merge(*per_key, reverse=True):
+                # A query citing several pages of the domain appears more than once
+                if query_id not in query_ids:
+                    query_ids.append(query_id)
+                    if len(query_ids) >= limit:
+                        break
+            conn.close()
+            
+            rows = self._get_queries_by_ids(query_ids)
+            
+            return [
+                {
+                    'id': row[0],
+                    'session_id': row[1],
+                    'query': row[2],
+                    'response': row[3],
+                    'created_at': row[4]
+                }
+                for row in (rows[query_id] for query_id in query_ids if query_id in rows)
+            ]
+        except Exception as e:
+            print(f"Error searching by domain: {e}")
+            return []
+    
+    def _get_queries_by_ids(self, query_ids: List[int]) -> Dict[int, tuple]:
+        """Fetch research query rows by primary key, routing each id to its partition"""
+        if not query_ids:
+            return {}
+        
+        sql = '''
+            SELECT id, session_id, query, response, created_at
+            FROM research_queries
+            WHERE id IN ({})
+        '''
+        
+        if not self.partition_by:
+            conn = sqlite3.connect(self.db_path)
+            rows = conn.execute(sql.format(','.join('?' * len(query_ids))), query_ids).fetchall()
+            conn.close()
+            return {row[0]: row for row in rows}
+        
+        # The id range tells which partition a query was written to
+        by_partition = {}
+        for query_id in query_ids:
+            by_partition.setdefault(query_id // PARTITION_ID_SPAN, []).append(query_id)
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, path FROM partitions WHERE id IN ({})'.format(
+            ','.join('?' * len(by_partition))), list(by_partition))
+        paths = dict(cursor.fetchall())
+        conn.close()
+        
+        rows = {}
+        for ordinal, ids in by_partition.items():
+            if ordinal not in paths:
+                continue
+            try:
+                # Read-only, so a missing partition is skipped rather than recreated empty
+                part_conn = sqlite3.connect(Path(paths[ordinal]).absolute().as_uri() + '?mode=ro', uri=True)
+                try:
+                    for row in part_conn.execute(sql.format(','.join('?' * len(ids))), ids):
+                        rows[row[0]] = row
+                finally:
+                    part_conn.close()
+            except sqlite3.OperationalError as e:
+                print(f"Skipping unreadable partition {paths[ordinal]}: {e}")
+        return rows
+    
+    def get_sources(self, domain: Optional[str] = None, session_id: Optional[str] = None,
+                    limit: int = 50) -> List[Dict]:
+        """Get cited sources, most cited first, optionally for one domain (and its subdomains) or session"""
+        domain_filter = ''
+        domain_params = ()
+        if domain:
+            domain_filter = 'AND s.domain_key >= ? AND s.domain_key < ?'
+            domain_params = self._domain_range(domain)
+        
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            if session_id:
+                cursor.execute(f'''
+                    SELECT s.id, s.url, s.domain, s.title, COUNT(*) AS citations,
+                           s.first_cited_at, MAX(qs.created_at)
+                    FROM query_sources qs
+                    JOIN sources s ON s.id = qs.source_id
+                    WHERE qs.session_id = ? {domain_filter}
+                    GROUP BY s.id
+                    ORDER BY citations DESC, s.id
+                    LIMIT ?
+                ''', (session_id, *domain_params, limit))
+            else:
+                cursor.execute(f'''
+                    SELECT s.id, s.url, s.domain, s.title, s.citation_count,
+                           s.first_cited_at, s.last_cited_at
+                    FROM sources s
+                    WHERE s.citation_count > 0 {domain_filter}
+                    ORDER BY s.citation_count DESC, s.id
+                    LIMIT ?
+                ''', (*domain_params, limit))
+            
+            rows = cursor.fetchall()
+            conn.close()
+            
+            return [
+                {
+                    'id': row[0],
+                    'url': row[1],
+                    'domain': row[2],
+                    'title': row[3],
+                    'citation_count': row[4],
+                    'first_cited_at': row[5],
+                    'last_cited_at': row[6]
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            print(f"Error getting sources: {e}")
+            return []
+    
+    def backfill_sources(self, batch_size: int = 500) -> int:
+        """Index citations for research saved before the source index existed.
+        
+        Safe to re-run: already indexed query/source pairs are skipped.
+        Returns the number of queries processed.
+        """
+        if self.partition_by:
+            paths = [path for path, _ in self._list_partitions()]
+        else:
+            paths = [self.db_path]
+        
+        processed = 0
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            for path in paths:
+                source_conn = sqlite3.connect(path)
+                last_id = 0
+                while True:
+                    rows = source_conn.execute('''
+                        SELECT id, session_id, response, created_at
+                        FROM research_queries
+                        WHERE id > ?
+                        ORDER BY id
+                        LIMIT ?
+                    ''', (last_id, batch_size)).fetchall()
+                    if not rows:
+                        break
+                    
+                    for query_id, session_id, response, created_at in rows:
+                        self._index_sources(cursor, query_id, session_id, response, created_at)
+                    conn.commit()
+                    
+                    processed += len(rows)
+                    last_id = rows[-1][0]
+                source_conn.close()
+            
+            conn.close()
+        except Exception as e:
+            print(f"Error backfilling sources: {e}")
+        return processed
+    
     def get_database_stats(self) -> Dict:
         """Get database statistics"""
+        if self.partition_by:
+            return self._get_partitioned_database_stats()
+        
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -235,14 +941,64 @@ class ResearchDatabase:
             print(f"Error getting database stats: {e}")
             return {}
     
+    def _get_partitioned_database_stats(self) -> Dict:
+        """Get database statistics aggregated across all partitions"""
+        try:
+            total_queries = 0
+            total_tokens = 0
+            timed_queries = 0
+            total_response_time = 0.0
+            
+            for conn in self._partition_batches():
+                count, tokens, timed, response_time = conn.execute('''
+                    SELECT COUNT(*), SUM(tokens_used),
+                           SUM(response_time > 0), SUM(CASE WHEN response_time > 0 THEN response_time END)
+                    FROM research_queries
+                ''').fetchone()
+                total_queries += count
+                total_tokens += tokens or 0
+                timed_queries += timed or 0
+                total_response_time += response_time or 0.0
+            
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT COUNT(*) FROM research_sessions')
+            total_sessions = cursor.fetchone()[0]
+            
+            conn.close()
+            
+            avg_response_time = total_response_time / timed_queries if timed_queries else 0.0
+            
+            return {
+                'total_queries': total_queries,
+                'total_sessions': total_sessions,
+                'total_tokens': total_tokens,
+                'avg_response_time': round(avg_response_time, 2)
+            }
+        except Exception as e:
+            print(f"Error getting database stats: {e}")
+            return {}
+    
     def clear_all_data(self) -> bool:
         """Clear all research data from database"""
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            # Delete all queries first (due to foreign key constraint)
-            cursor.execute('DELETE FROM research_queries')
+            if self.partition_by:
+                # Drop every partition file along with the routing tables
+                self._remove_partition_files(cursor)
+                cursor.execute('DELETE FROM session_partitions')
+                cursor.execute('DELETE FROM partitions')
+                self._partition_paths.clear()
+            else:
+                # Delete all queries first (due to foreign key constraint)
+                cursor.execute('DELETE FROM research_queries')
+            
+            # Delete the citation index
+            cursor.execute('DELETE FROM query_sources')
+            cursor.execute('DELETE FROM sources')
             
             # Delete all sessions
             cursor.execute('DELETE FROM research_sessions')
@@ -254,6 +1010,32 @@ class ResearchDatabase:
             print(f"Error clearing all data: {e}")
             return False
     
+    def _remove_partition_files(self, cursor):
+        """Delete all registered partition files, including archived ones"""
+        cursor.execute('SELECT path FROM partitions')
+        for (path,) in cursor.fetchall():
+            if os.path.exists(path):
+                os.chmod(path, 0o644)
+                os.remove(path)
+    
+    def remove_database_files(self):
+        """Delete the database file and every partition file registered in it"""
+        if os.path.exists(self.db_path):
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            # Check the registry rather than the mode, so files of a
+            # partitioned install go too when opened without partition_by
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'partitions'")
+            if cursor.fetchone():
+                self._remove_partition_files(cursor)
+            conn.close()
+        
+        shutil.rmtree(self.partition_dir, ignore_errors=True)
+        self._partition_paths.clear()
+        
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+    
     def close(self):
         """Close database connection (if needed for cleanup)"""
         pass
\ No newline at end of file
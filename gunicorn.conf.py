@@ -0,0 +1,31 @@
+"""
+Gunicorn configuration for Reka Research Web App
+Picked up automatically when gunicorn is started from the project directory
+"""
+
+import os
+import sys
+
+# Served app; the schema is migrated by on_starting, not by the workers
+wsgi_app = 'wsgi:app'
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+
+# Import the app once in the master, then fork
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+def on_starting(server):
+    # Runs once in the master before any worker is forked, with or without
+    # preload. Only database is imported, so without preload the master
+    # stays free of Flask and OpenAI.
+    from database import migrate_database
+    migrate_database()
+
+def post_fork(server, worker):
+    # Make sure no client connection pool or database handle created in the
+    # master is reused by the worker
+    wsgi_module = sys.modules.get('wsgi')
+    if wsgi_module is not None:
+        from app import reset_resources
+        reset_resources(wsgi_module.app)
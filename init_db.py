@@ -6,24 +6,30 @@ Run this script to initialize the database with required tables
 
 import os
 import sys
+from dotenv import load_dotenv
 from database import ResearchDatabase
 
 def main():
     print("Initializing Reka Research Database...")
     
+    # Use the same database settings as the app
+    load_dotenv()
+    db_path = os.getenv("DATABASE_PATH", "research.db")
+    partition_by = os.getenv("DB_PARTITION_BY")
+    
     # Check if database already exists
-    db_path = "research.db"
     if os.path.exists(db_path):
         response = input(f"Database '{db_path}' already exists. Recreate? (y/N): ")
         if response.lower() == 'y':
-            os.remove(db_path)
+            # Partition files go too, or they would reappear in the new database
+            ResearchDatabase(db_path, partition_by=partition_by, init_schema=False).remove_database_files()
             print("[OK] Existing database removed")
         else:
             print("[INFO] Using existing database")
     
     try:
         # Initialize database
-        db = ResearchDatabase(db_path)
+        db = ResearchDatabase(db_path, partition_by=partition_by)
         print("[OK] Database initialized successfully!")
         
         # Show database info
@@ -32,6 +38,8 @@ def main():
         print(f"   - Total queries: {stats.get('total_queries', 0)}")
         print(f"   - Total sessions: {stats.get('total_sessions', 0)}")
         print(f"   - Database file: {os.path.abspath(db_path)}")
+        if partition_by:
+            print(f"   - Partitioned by: {partition_by} ({os.path.abspath(db.partition_dir)})")
         
         # Test database functionality
         print("\nTesting database functionality...")
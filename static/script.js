@@ -471,7 +471,11 @@ class ChatApp {
 
         try {
             this.showHistoryLoading(true);
-            const response = await fetch(`/api/search?q=${encodeURIComponent(query)}&limit=20`);
+            // "site:example.com" searches the citation index by domain
+            const domainMatch = query.match(/^site:(\S+)$/i);
+            const response = domainMatch
+                ? await fetch(`/api/search?domain=${encodeURIComponent(domainMatch[1])}&limit=20`)
+                : await fetch(`/api/search?q=${encodeURIComponent(query)}&limit=20`);
             const data = await response.json();
             
             if (data.success) {
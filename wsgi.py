@@ -0,0 +1,9 @@
+"""
+WSGI entry point for Reka Research Web App
+Used by gunicorn (see gunicorn.conf.py); the schema is migrated once in the
+gunicorn master, so the app built here skips it
+"""
+
+from app import create_app
+
+app = create_app({'MIGRATE_ON_START': False})